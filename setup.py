@@ -41,6 +41,9 @@ setup(
             "flake8>=6.1.0",
             "isort>=5.13.2",
         ],
+        "speedups": [
+            "orjson>=3.8.0",
+        ],
         "video": [
             "ffmpeg-python>=0.2.0",
             "moviepy>=1.0.3",
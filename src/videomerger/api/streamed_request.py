@@ -0,0 +1,67 @@
+"""Request class that spools multipart uploads straight into the upload folder."""
+import os
+import tempfile
+
+from flask import Request, current_app
+from werkzeug.datastructures import FileStorage
+
+from videomerger.utils.file_utils import DEFAULT_FILE_MODE
+
+
+class StreamedRequest(Request):
+    """Request that writes uploaded files directly into ``UPLOAD_FOLDER``.
+
+    Werkzeug normally spools each uploaded file to a temporary file in the
+    system temp directory, which ``FileStorage.save`` then copies to its
+    destination. Spooling into the upload folder instead lets
+    ``save_upload`` move the finished file into place with a rename, so the
+    data is written to disk only once.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the request."""
+        super().__init__(*args, **kwargs)
+        self._spooled_paths = []
+
+    def _get_file_stream(
+        self, total_content_length, content_type, filename=None, content_length=None
+    ):
+        """Return a file in the upload folder to receive an uploaded file."""
+        stream = tempfile.NamedTemporaryFile(
+            mode="w+b",
+            dir=current_app.config["UPLOAD_FOLDER"],
+            prefix=".upload-",
+            delete=False,
+        )
+        self._spooled_paths.append(stream.name)
+        return stream
+
+    def save_upload(self, file: FileStorage, destination: str):
+        """
+        Save an uploaded file, renaming its spool file when possible.
+
+        Args:
+            file: Uploaded file from ``request.files``
+            destination: Path where the file should be stored
+        """
+        spooled_path = getattr(file.stream, "name", None)
+        if spooled_path not in self._spooled_paths:
+            file.save(destination, buffer_size=current_app.config["COPY_BUFFER_SIZE"])
+            return
+
+        file.stream.close()
+        # NamedTemporaryFile creates the spool file 0600; give the upload
+        # the same permissions a normally created file would get.
+        os.chmod(spooled_path, DEFAULT_FILE_MODE)
+        os.replace(spooled_path, destination)
+        self._spooled_paths.remove(spooled_path)
+
+    def close(self):
+        """Close uploaded files and remove spool files that were not saved."""
+        super().close()
+        for path in self._spooled_paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._spooled_paths = []
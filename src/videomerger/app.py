@@ -1,28 +1,34 @@
 """Main Flask application entry point."""
+import functools
+import mimetypes
 import os
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file
 from werkzeug.utils import secure_filename
 
+from videomerger.api.json_provider import ORJSONProvider, orjson
+from videomerger.api.streamed_request import StreamedRequest
+from videomerger.core.merge_jobs import MergeJobQueue
 from videomerger.core.video_processor import VideoProcessor
 from videomerger.utils.config import Config
+from videomerger.utils.file_utils import write_stream
 
 
 def create_app(config=None):
     """Application factory pattern for creating Flask app."""
     app = Flask(__name__, template_folder="templates", static_folder="static")
+    app.request_class = StreamedRequest
+    if orjson is not None:
+        app.json = ORJSONProvider(app)
 
     # Load configuration
-    if config is None:
-        app.config.from_object(Config)
-    else:
-        app.config.from_object(config)
+    app.config.from_object(config or Config)
 
-    # Ensure upload and output directories exist
-    os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
-    os.makedirs(app.config["OUTPUT_FOLDER"], exist_ok=True)
+    # Ensure upload, output and job directories exist
+    _ensure_dirs(
+        app.config["UPLOAD_FOLDER"], app.config["OUTPUT_FOLDER"], app.config["JOB_FOLDER"]
+    )
 
-    # Initialize video processor
-    video_processor = VideoProcessor()
+    video_processor, merge_jobs = _create_services(app.config)
 
     @app.route("/")
     def index():
@@ -39,13 +45,9 @@ def create_app(config=None):
         if not files or len(files) < 2:
             return jsonify({"error": "At least 2 videos are required"}), 400
 
-        uploaded_files = []
-        for file in files:
-            if file and allowed_file(file.filename, app.config["ALLOWED_EXTENSIONS"]):
-                filename = secure_filename(file.filename)
-                filepath = os.path.join(app.config["UPLOAD_FOLDER"], filename)
-                file.save(filepath)
-                uploaded_files.append(filepath)
+        uploaded_files = _save_uploads(
+            files, app.config["UPLOAD_FOLDER"], app.config["ALLOWED_EXTENSIONS"]
+        )
 
         if len(uploaded_files) < 2:
             return jsonify({"error": "Invalid file types"}), 400
@@ -61,9 +63,24 @@ def create_app(config=None):
             200,
         )
 
+    @app.route("/api/upload/<filename>", methods=["PUT"])
+    def stream_upload(filename):
+        """Stream a single raw video body straight to the upload folder."""
+        filename = secure_filename(filename)
+        if not allowed_file(filename, app.config["ALLOWED_EXTENSIONS"]):
+            return jsonify({"error": "Invalid file type"}), 400
+
+        filepath = os.path.join(app.config["UPLOAD_FOLDER"], filename)
+        write_stream(request.stream, filepath, app.config["COPY_BUFFER_SIZE"])
+
+        return (
+            jsonify({"message": "File uploaded successfully", "file": filepath}),
+            201,
+        )
+
     @app.route("/api/merge", methods=["POST"])
     def merge_videos():
-        """Merge uploaded videos."""
+        """Queue a merge of uploaded videos."""
         data = request.get_json()
 
         if not data or "files" not in data:
@@ -73,23 +90,48 @@ def create_app(config=None):
         output_filename = data.get("output_name", "merged_video.mp4")
 
         try:
-            output_path = video_processor.merge_videos(
-                video_files, os.path.join(app.config["OUTPUT_FOLDER"], output_filename)
-            )
-            return (
-                jsonify({"message": "Videos merged successfully", "output_file": output_path}),
-                200,
-            )
-        except Exception as e:
-            return jsonify({"error": str(e)}), 500
+            video_processor.check_remote_inputs(video_files)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        job_id = merge_jobs.submit(
+            video_files, os.path.join(app.config["OUTPUT_FOLDER"], output_filename)
+        )
+        return jsonify({"message": "Merge started", "job_id": job_id}), 202
+
+    @app.route("/api/merge/stream", methods=["POST"])
+    def stream_merge():
+        """Merge compatible videos and stream the result as it is produced."""
+        data = request.get_json()
+
+        if not data or "files" not in data:
+            return jsonify({"error": "No files specified"}), 400
+
+        return _merge_stream_response(
+            video_processor,
+            data["files"],
+            app.config["UPLOAD_FOLDER"],
+            app.config["COPY_BUFFER_SIZE"],
+            app.logger,
+        )
+
+    @app.route("/api/status/<job_id>")
+    def merge_status(job_id):
+        """Report the status of a queued merge."""
+        status = merge_jobs.get_status(job_id)
+        if status is None:
+            return jsonify({"error": "Job not found"}), 404
+        return jsonify(status), 200
 
     @app.route("/api/download/<filename>")
     def download_video(filename):
-        """Download merged video."""
+        """Serve a merged video, honoring Range requests for seeking and resuming."""
         filepath = os.path.join(app.config["OUTPUT_FOLDER"], secure_filename(filename))
-        if os.path.exists(filepath):
-            return send_file(filepath, as_attachment=True)
-        return jsonify({"error": "File not found"}), 404
+        return _download_response(
+            filepath,
+            as_attachment=request.args.get("download") == "1",
+            x_accel_prefix=app.config["X_ACCEL_REDIRECT_PREFIX"],
+        )
 
     @app.route("/health")
     def health():
@@ -99,9 +141,111 @@ def create_app(config=None):
     return app
 
 
-def allowed_file(filename, allowed_extensions):
+@functools.lru_cache(maxsize=None)
+def _ensure_dirs(*directories):
+    """Create the app's directories once per process for each distinct set of paths."""
+    for directory in directories:
+        os.makedirs(directory, exist_ok=True)
+
+
+def _create_services(config):
+    """Build the video processor and the merge job queue from the app config."""
+    video_processor = VideoProcessor(
+        remote_hosts=config["REMOTE_INPUT_HOSTS"] if config["ALLOW_REMOTE_INPUTS"] else None,
+        max_download_size=config["MAX_CONTENT_LENGTH"],
+    )
+    merge_jobs = MergeJobQueue(
+        video_processor,
+        config["JOB_FOLDER"],
+        max_workers=config["MERGE_WORKERS"],
+        retention=config["JOB_RETENTION"],
+    )
+    return video_processor, merge_jobs
+
+
+def _save_uploads(files, upload_folder, allowed_extensions):
+    """Save the allowed files of a multipart upload and return their paths."""
+    uploaded_files = []
+    for file in files:
+        if not file or not file.filename:
+            continue
+        # Check the sanitized name: secure_filename can strip a hostile
+        # name down to nothing or drop its extension entirely.
+        filename = secure_filename(file.filename)
+        if not allowed_file(filename, allowed_extensions):
+            continue
+        filepath = os.path.join(upload_folder, filename)
+        request.save_upload(file, filepath)
+        uploaded_files.append(filepath)
+    return uploaded_files
+
+
+def _merge_stream_response(video_processor, video_files, upload_folder, buffer_size, logger):
+    """Start a streaming merge of uploaded files and wrap its output in a response."""
+    try:
+        process = video_processor.open_merge_stream(video_files, upload_folder)
+    except (ValueError, FileNotFoundError) as e:
+        return jsonify({"error": str(e)}), 400
+    except RuntimeError as e:
+        return jsonify({"error": str(e)}), 500
+
+    return Response(_stream_process(process, buffer_size, logger), mimetype="video/mp4")
+
+
+def _stream_process(process, buffer_size, logger):
+    """Yield an FFmpeg process's stdout, stopping it if the client goes away."""
+    try:
+        yield from iter(lambda: process.stdout.read(buffer_size), b"")
+    finally:
+        # Stop FFmpeg if the client disconnects before the end
+        killed = process.poll() is None
+        if killed:
+            process.kill()
+        process.stdout.close()
+        errors = process.stderr.read()
+        process.stderr.close()
+        process.wait()
+        if process.returncode != 0 and not killed:
+            logger.error(
+                "FFmpeg stream merge failed with exit code %s: %s",
+                process.returncode,
+                errors.decode("utf-8", "replace").strip(),
+            )
+
+
+def _download_response(filepath, as_attachment, x_accel_prefix):
+    """Serve ``filepath`` via the reverse proxy if configured, else with Range support."""
+    if not os.path.exists(filepath):
+        return jsonify({"error": "File not found"}), 404
+
+    filename = os.path.basename(filepath)
+    if x_accel_prefix:
+        # Let the reverse proxy stream the file with sendfile and its own
+        # Range handling instead of copying it through the worker.
+        response = Response(
+            mimetype=mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        )
+        response.headers["X-Accel-Redirect"] = x_accel_prefix.rstrip("/") + "/" + filename
+        if as_attachment:
+            response.headers.set("Content-Disposition", "attachment", filename=filename)
+        return response
+
+    response = send_file(
+        filepath,
+        as_attachment=as_attachment,
+        conditional=True,
+        etag=True,
+    )
+    # Werkzeug only advertises range support on 206 responses; announce it
+    # up front so clients know they can split or resume the download.
+    response.headers["Accept-Ranges"] = "bytes"
+    return response
+
+
+def allowed_file(filename, allowed_extensions=Config.ALLOWED_EXTENSIONS):
     """Check if file has allowed extension."""
-    return "." in filename and filename.rsplit(".", 1)[1].lower() in allowed_extensions
+    _, dot, extension = filename.rpartition(".")
+    return bool(dot) and extension.lower() in allowed_extensions
 
 
 if __name__ == "__main__":
@@ -0,0 +1,161 @@
+"""Background execution of video merge jobs."""
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+# How often the owning process touches the status files of its live jobs
+HEARTBEAT_INTERVAL = 10.0
+
+# A pending/running job whose status file is older than this has lost its worker
+STALE_AFTER = 6 * HEARTBEAT_INTERVAL
+
+
+class MergeJobQueue:
+    """Run merges off the request thread and track their status on disk.
+
+    Status is kept as one small JSON file per job so that any worker process
+    sharing the status folder can answer a status query, not just the one
+    that accepted the job. The owning process refreshes the mtime of its
+    unfinished jobs' files, so a job whose worker died is reported as failed
+    instead of staying ``running`` forever.
+    """
+
+    def __init__(
+        self,
+        video_processor,
+        status_folder: str,
+        max_workers: int = 2,
+        retention: float = 24 * 60 * 60,
+    ):
+        """
+        Initialize the job queue.
+
+        Args:
+            video_processor: Object providing ``merge_videos(files, output)``
+            status_folder: Existing directory where job status files are stored
+            max_workers: Maximum number of merges running at the same time
+            retention: Seconds a status file is kept after its last update
+        """
+        self.video_processor = video_processor
+        self.status_folder = status_folder
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="merge-job"
+        )
+        self._active = set()
+        self._lock = threading.Lock()
+        self._heartbeat = None
+
+    def submit(self, video_files: List[str], output_path: str) -> str:
+        """
+        Queue a merge and return immediately.
+
+        Args:
+            video_files: List of paths to video files to merge
+            output_path: Path where the merged video will be saved
+
+        Returns:
+            Identifier of the queued job
+        """
+        self.expire_old_jobs()
+        job_id = uuid.uuid4().hex
+        self._write_status(job_id, {"status": "pending"})
+        with self._lock:
+            self._active.add(job_id)
+            if self._heartbeat is None:
+                self._heartbeat = threading.Thread(
+                    target=self._heartbeat_loop, name="merge-job-heartbeat", daemon=True
+                )
+                self._heartbeat.start()
+        self._executor.submit(self._run, job_id, video_files, output_path)
+        return job_id
+
+    def get_status(self, job_id: str) -> Optional[dict]:
+        """
+        Get the status of a job.
+
+        Args:
+            job_id: Identifier returned by ``submit``
+
+        Returns:
+            Status dictionary, or None if the job is unknown
+        """
+        try:
+            path = self._status_path(job_id)
+        except ValueError:
+            return None
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                status = json.load(f)
+                updated = os.fstat(f.fileno()).st_mtime
+        except (OSError, ValueError):
+            return None
+
+        if status.get("status") in ("pending", "running") and time.time() - updated > STALE_AFTER:
+            return {
+                "status": "failed",
+                "error": "Merge worker stopped before the job finished",
+                "job_id": job_id,
+            }
+        return status
+
+    def expire_old_jobs(self):
+        """Remove status files that have not been updated within ``retention``."""
+        cutoff = time.time() - self.retention
+        try:
+            entries = os.scandir(self.status_folder)
+        except FileNotFoundError:
+            return
+
+        with entries:
+            for entry in entries:
+                if not entry.name.endswith((".json", ".json.tmp")):
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                except FileNotFoundError:
+                    continue
+
+    def _run(self, job_id: str, video_files: List[str], output_path: str):
+        """Execute a merge and record its outcome."""
+        try:
+            self._write_status(job_id, {"status": "running"})
+            try:
+                output_file = self.video_processor.merge_videos(video_files, output_path)
+            except Exception as e:
+                self._write_status(job_id, {"status": "failed", "error": str(e)})
+                return
+            self._write_status(job_id, {"status": "completed", "output_file": output_file})
+        finally:
+            with self._lock:
+                self._active.discard(job_id)
+
+    def _heartbeat_loop(self):
+        """Keep the status files of this process's unfinished jobs fresh."""
+        while True:
+            time.sleep(HEARTBEAT_INTERVAL)
+            with self._lock:
+                job_ids = list(self._active)
+            for job_id in job_ids:
+                try:
+                    os.utime(self._status_path(job_id))
+                except OSError:
+                    pass
+
+    def _status_path(self, job_id: str) -> str:
+        """Map a job id to its status file, rejecting anything but a UUID."""
+        return os.path.join(self.status_folder, f"{uuid.UUID(hex=job_id).hex}.json")
+
+    def _write_status(self, job_id: str, status: dict):
+        """Atomically replace the status file so readers never see partial JSON."""
+        path = self._status_path(job_id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(dict(status, job_id=job_id), f)
+        os.replace(tmp_path, path)
@@ -1,34 +1,104 @@
 """Video processing module for merging videos."""
 import os
-from typing import List
+import shutil
+import subprocess
+import tempfile
+import urllib.parse
+from typing import Iterable, List, Optional
+
+from videomerger.utils.http_download import download_file, is_remote
+from videomerger.video_processor_cli import build_concat_list, can_stream_copy, probe_video
+
+# ffprobe codec names the MP4 muxer accepts without re-encoding
+MP4_VIDEO_CODECS = frozenset({"h264", "hevc", "av1", "mpeg4"})
+MP4_AUDIO_CODECS = frozenset({"aac", "mp3", "ac3", "eac3", "alac"})
 
 
 class VideoProcessor:
     """Handle video merging operations."""
 
-    def __init__(self):
-        """Initialize the video processor."""
+    def __init__(
+        self,
+        remote_hosts: Optional[Iterable[str]] = None,
+        max_download_size: Optional[int] = None,
+    ):
+        """
+        Initialize the video processor.
+
+        Args:
+            remote_hosts: Hosts that HTTP(S) inputs may be fetched from;
+                remote inputs are refused when empty
+            max_download_size: Largest remote input accepted, in bytes
+        """
         self.supported_formats = ["mp4", "avi", "mov", "mkv", "webm"]
+        self._supported_set = frozenset(self.supported_formats)
+        self.remote_hosts = frozenset(host.lower() for host in remote_hosts or ())
+        self.max_download_size = max_download_size
+
+    def check_remote_inputs(self, video_files: List[str]):
+        """
+        Reject remote inputs unless their host is explicitly allowed.
+
+        Args:
+            video_files: List of paths or URLs of video files
+
+        Raises:
+            ValueError: If a URL is given while remote inputs are disabled,
+                or its host is not in the allow-list
+        """
+        for video_file in video_files:
+            if not is_remote(video_file):
+                continue
+            if not self.remote_hosts:
+                raise ValueError("Remote video inputs are disabled")
+            host = urllib.parse.urlsplit(video_file).hostname
+            if host not in self.remote_hosts:
+                raise ValueError(f"Remote host not allowed: {host}")
 
     def merge_videos(self, video_files: List[str], output_path: str) -> str:
         """
         Merge multiple videos into a single output file.
 
         Args:
-            video_files: List of paths to video files to merge
+            video_files: List of paths or HTTP(S) URLs of video files to merge
             output_path: Path where the merged video will be saved
 
         Returns:
             Path to the merged video file
 
         Raises:
-            ValueError: If video files list is invalid
+            ValueError: If video files list is invalid or a remote input is not allowed
             FileNotFoundError: If input files don't exist
             RuntimeError: If merging fails
         """
         if not video_files or len(video_files) < 2:
             raise ValueError("At least 2 video files are required for merging")
 
+        if not any(is_remote(video_file) for video_file in video_files):
+            return self._merge_local(video_files, output_path)
+        self.check_remote_inputs(video_files)
+
+        # Fetch remote inputs first; each is split across parallel range requests
+        download_dir = tempfile.mkdtemp(prefix="videomerger_remote_")
+        try:
+            local_files = []
+            for index, video_file in enumerate(video_files):
+                if is_remote(video_file):
+                    name = os.path.basename(urllib.parse.urlsplit(video_file).path)
+                    destination = os.path.join(download_dir, f"{index}_{name or 'input'}")
+                    try:
+                        video_file = download_file(
+                            video_file, destination, max_size=self.max_download_size
+                        )
+                    except (OSError, ValueError) as e:
+                        raise RuntimeError(f"Failed to download {video_file}: {e}") from e
+                local_files.append(video_file)
+            return self._merge_local(local_files, output_path)
+        finally:
+            shutil.rmtree(download_dir, ignore_errors=True)
+
+    def _merge_local(self, video_files: List[str], output_path: str) -> str:
+        """Merge video files that are already on local disk."""
         # Validate all input files exist
         for video_file in video_files:
             if not os.path.exists(video_file):
@@ -48,6 +118,95 @@ class VideoProcessor:
 
         return output_path
 
+    def open_merge_stream(self, video_files: List[str], input_folder: str) -> subprocess.Popen:
+        """
+        Start an FFmpeg process that writes the merged video to its stdout.
+
+        Inputs are joined with stream copy, so they must share codecs and
+        stream parameters, and those codecs must fit in MP4. The output is fragmented MP4, which can be sent
+        to a client as it is produced without a seekable file.
+
+        Args:
+            video_files: List of paths to video files to merge
+            input_folder: Directory every input must resolve into
+
+        Returns:
+            Running FFmpeg process; read the merged video from its stdout
+            and any error messages from its stderr
+
+        Raises:
+            ValueError: If video files list is invalid, an input lies outside
+                ``input_folder``, the inputs differ in codecs or stream
+                parameters, or MP4 cannot carry their codecs
+            FileNotFoundError: If input files don't exist
+            RuntimeError: If FFmpeg cannot be started
+        """
+        if not video_files or len(video_files) < 2:
+            raise ValueError("At least 2 video files are required for merging")
+
+        # The merged bytes go straight back to the client, so only files
+        # from the upload folder may be read; resolve symlinks and "..".
+        input_folder = os.path.realpath(input_folder)
+        resolved_files = []
+        for video_file in video_files:
+            path = os.path.realpath(video_file)
+            if os.path.commonpath([input_folder, path]) != input_folder:
+                raise ValueError(f"Video file is outside the upload folder: {video_file}")
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Video file not found: {video_file}")
+            resolved_files.append(path)
+        video_files = resolved_files
+
+        # Stream copy of mismatched inputs produces a broken file, and by
+        # the time FFmpeg notices, the response has already started.
+        probes = [probe_video(path) for path in video_files]
+        if not can_stream_copy(probes):
+            raise ValueError("Videos must share codecs and stream parameters to be streamed")
+        video_codec, audio_codec = probes[0]["signature"][0], probes[0]["signature"][5]
+        if video_codec not in MP4_VIDEO_CODECS or (
+            audio_codec is not None and audio_codec not in MP4_AUDIO_CODECS
+        ):
+            raise ValueError(
+                f"Codecs {video_codec}/{audio_codec or 'none'} cannot be streamed as MP4; "
+                "use /api/merge to re-encode them"
+            )
+
+        cmd = [
+            "ffmpeg",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-f",
+            "concat",
+            "-safe",
+            "0",
+            "-protocol_whitelist",
+            "file,pipe",
+            "-i",
+            "pipe:0",
+            "-c",
+            "copy",
+            "-movflags",
+            "frag_keyframe+empty_moov",
+            "-f",
+            "mp4",
+            "pipe:1",
+        ]
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                # Only errors are logged, so the pipe cannot fill and stall FFmpeg
+                stderr=subprocess.PIPE,
+            )
+        except OSError as e:
+            raise RuntimeError(f"Could not start FFmpeg: {e}") from e
+
+        process.stdin.write(build_concat_list(video_files).encode("utf-8"))
+        process.stdin.close()
+        return process
+
     def validate_video(self, video_path: str) -> bool:
         """
         Validate if a file is a supported video format.
@@ -58,11 +217,12 @@ class VideoProcessor:
         Returns:
             True if video is valid, False otherwise
         """
-        if not os.path.exists(video_path):
+        # Check the extension first so unsupported files never cost a stat
+        extension = os.path.splitext(video_path)[1][1:].lower()
+        if extension not in self._supported_set:
             return False
 
-        extension = video_path.rsplit(".", 1)[-1].lower()
-        return extension in self.supported_formats
+        return os.path.exists(video_path)
 
     def get_video_info(self, video_path: str) -> dict:
         """
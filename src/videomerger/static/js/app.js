@@ -114,32 +114,34 @@ class VideoMergerApp {
             return;
         }
 
-        const formData = new FormData();
-        this.selectedFiles.forEach(file => {
-            formData.append('videos', file);
-        });
-
         this.uploadBtn.disabled = true;
         this.showStatus('Uploading videos...', 'info');
         this.progressBar.style.display = 'block';
 
         try {
-            const response = await fetch('/api/upload', {
-                method: 'POST',
-                body: formData
-            });
-
-            const data = await response.json();
-
-            if (response.ok) {
-                this.uploadedFilePaths = data.files;
-                this.showStatus(`Successfully uploaded ${data.count} videos!`, 'success');
-                this.mergeBtn.style.display = 'inline-block';
-                this.uploadBtn.style.display = 'none';
-            } else {
-                this.showStatus(`Error: ${data.error}`, 'error');
-                this.uploadBtn.disabled = false;
+            // Send each file as a raw request body so the server can stream it
+            // straight to disk instead of parsing a multipart form.
+            const uploadedPaths = [];
+            for (const file of this.selectedFiles) {
+                const response = await fetch(`/api/upload/${encodeURIComponent(file.name)}`, {
+                    method: 'PUT',
+                    body: file
+                });
+
+                const data = await response.json();
+
+                if (!response.ok) {
+                    this.showStatus(`Error: ${data.error}`, 'error');
+                    this.uploadBtn.disabled = false;
+                    return;
+                }
+                uploadedPaths.push(data.file);
             }
+
+            this.uploadedFilePaths = uploadedPaths;
+            this.showStatus(`Successfully uploaded ${uploadedPaths.length} videos!`, 'success');
+            this.mergeBtn.style.display = 'inline-block';
+            this.uploadBtn.style.display = 'none';
         } catch (error) {
             this.showStatus(`Upload failed: ${error.message}`, 'error');
             this.uploadBtn.disabled = false;
@@ -174,11 +176,18 @@ class VideoMergerApp {
 
             const data = await response.json();
 
-            if (response.ok) {
+            if (!response.ok) {
+                this.showStatus(`Error: ${data.error}`, 'error');
+                this.mergeBtn.disabled = false;
+                return;
+            }
+
+            const job = await this.waitForJob(data.job_id);
+            if (job.status === 'completed') {
                 this.showStatus('Videos merged successfully!', 'success');
                 this.showDownloadLink(outputFilename);
             } else {
-                this.showStatus(`Error: ${data.error}`, 'error');
+                this.showStatus(`Error: ${job.error}`, 'error');
                 this.mergeBtn.disabled = false;
             }
         } catch (error) {
@@ -189,6 +198,23 @@ class VideoMergerApp {
         }
     }
 
+    async waitForJob(jobId, timeoutMs = 60 * 60 * 1000) {
+        // Merges run in the background; poll until the job finishes or we give up.
+        const deadline = Date.now() + timeoutMs;
+        while (Date.now() < deadline) {
+            const response = await fetch(`/api/status/${jobId}`);
+            const job = await response.json();
+            if (!response.ok) {
+                return { status: 'failed', error: job.error };
+            }
+            if (job.status === 'completed' || job.status === 'failed') {
+                return job;
+            }
+            await new Promise(resolve => setTimeout(resolve, 1000));
+        }
+        return { status: 'failed', error: 'Timed out waiting for the merge to finish' };
+    }
+
     showStatus(message, type) {
         this.statusMessage.textContent = message;
         this.statusMessage.className = `status-message ${type}`;
@@ -197,7 +223,7 @@ class VideoMergerApp {
     showDownloadLink(filename) {
         this.resultSection.style.display = 'block';
         this.downloadLink.innerHTML = `
-            <a href="/api/download/${filename}" class="download-link" download>
+            <a href="/api/download/${filename}?download=1" class="download-link" download>
                 Download Merged Video
             </a>
         `;
@@ -6,6 +6,12 @@ from pathlib import Path
 # Base directory of the project
 BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent
 
+# Default storage locations, resolved once at import
+STATIC_DIR = BASE_DIR / "src" / "videomerger" / "static"
+DEFAULT_UPLOAD_FOLDER = str(STATIC_DIR / "uploads")
+DEFAULT_OUTPUT_FOLDER = str(STATIC_DIR / "outputs")
+DEFAULT_JOB_FOLDER = str(STATIC_DIR / "jobs")
+
 
 class Config:
     """Base configuration class."""
@@ -15,21 +21,34 @@ class Config:
     DEBUG = os.getenv("DEBUG", "True") == "True"
 
     # Upload settings
-    UPLOAD_FOLDER = os.getenv(
-        "UPLOAD_FOLDER", str(BASE_DIR / "src" / "videomerger" / "static" / "uploads")
-    )
-    OUTPUT_FOLDER = os.getenv(
-        "OUTPUT_FOLDER", str(BASE_DIR / "src" / "videomerger" / "static" / "outputs")
-    )
+    UPLOAD_FOLDER = os.getenv("UPLOAD_FOLDER", DEFAULT_UPLOAD_FOLDER)
+    OUTPUT_FOLDER = os.getenv("OUTPUT_FOLDER", DEFAULT_OUTPUT_FOLDER)
+    JOB_FOLDER = os.getenv("JOB_FOLDER", DEFAULT_JOB_FOLDER)
 
     # File size limits (in bytes)
     MAX_CONTENT_LENGTH = int(os.getenv("MAX_CONTENT_LENGTH", 500 * 1024 * 1024))  # 500MB default
 
+    # Block size for copying upload data to disk (in bytes)
+    COPY_BUFFER_SIZE = int(os.getenv("COPY_BUFFER_SIZE", 1024 * 1024))  # 1MB default
+
+    # Internal nginx location that maps to OUTPUT_FOLDER (e.g. "/protected").
+    # When set, downloads are handed to nginx via X-Accel-Redirect.
+    X_ACCEL_REDIRECT_PREFIX = os.getenv("X_ACCEL_REDIRECT_PREFIX", "")
+
+    # Merging from HTTP(S) URLs is off by default; when enabled, only these
+    # comma-separated hosts may be fetched, up to MAX_CONTENT_LENGTH each.
+    ALLOW_REMOTE_INPUTS = os.getenv("ALLOW_REMOTE_INPUTS", "False") == "True"
+    REMOTE_INPUT_HOSTS = frozenset(
+        host.strip().lower() for host in os.getenv("REMOTE_INPUT_HOSTS", "").split(",") if host.strip()
+    )
+
     # Allowed video file extensions
-    ALLOWED_EXTENSIONS = {"mp4", "avi", "mov", "mkv", "webm"}
+    ALLOWED_EXTENSIONS = frozenset({"mp4", "avi", "mov", "mkv", "webm"})
 
     # Video processing settings
     MAX_VIDEOS_PER_MERGE = int(os.getenv("MAX_VIDEOS_PER_MERGE", 10))
+    MERGE_WORKERS = int(os.getenv("MERGE_WORKERS", 2))  # Concurrent merges per process
+    JOB_RETENTION = int(os.getenv("JOB_RETENTION", 24 * 60 * 60))  # Seconds to keep job status
     DEFAULT_OUTPUT_FORMAT = os.getenv("DEFAULT_OUTPUT_FORMAT", "mp4")
 
     # Application settings
@@ -60,6 +79,7 @@ class TestingConfig(Config):
     # Use temporary directories for testing
     UPLOAD_FOLDER = "/tmp/test_uploads"
     OUTPUT_FOLDER = "/tmp/test_outputs"
+    JOB_FOLDER = "/tmp/test_jobs"
 
 
 # Configuration dictionary
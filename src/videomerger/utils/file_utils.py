@@ -1,9 +1,24 @@
 """File handling utilities."""
+import heapq
 import os
-from typing import List
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, List
 from werkzeug.utils import secure_filename
 
 
+def _get_default_file_mode() -> int:
+    """Return the mode a plain open() would give new files under the current umask."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+# Temporary files are created 0600; published uploads get the usual mode
+DEFAULT_FILE_MODE = _get_default_file_mode()
+
+
 def clean_upload_folder(folder_path: str, keep_recent: int = 0):
     """
     Clean up old files from upload folder.
@@ -12,24 +27,30 @@ def clean_upload_folder(folder_path: str, keep_recent: int = 0):
         folder_path: Path to the folder to clean
         keep_recent: Number of recent files to keep (0 = delete all)
     """
-    if not os.path.exists(folder_path):
+    try:
+        entries = os.scandir(folder_path)
+    except FileNotFoundError:
         return
 
+    # DirEntry caches the file type and stat result, so each entry costs
+    # one stat at most instead of isfile + getmtime on the path.
     files = []
-    for filename in os.listdir(folder_path):
-        filepath = os.path.join(folder_path, filename)
-        if os.path.isfile(filepath):
-            files.append((filepath, os.path.getmtime(filepath)))
-
-    # Sort by modification time
-    files.sort(key=lambda x: x[1], reverse=True)
+    with entries:
+        for entry in entries:
+            try:
+                if entry.is_file(follow_symlinks=False):
+                    files.append((entry.path, entry.stat().st_mtime))
+            except FileNotFoundError:
+                # Removed by someone else since the directory was read
+                continue
+
+    # Keep the newest files; only they need ordering, not the whole folder
+    if keep_recent > 0:
+        keep = {path for path, _ in heapq.nlargest(keep_recent, files, key=lambda x: x[1])}
+        files = [item for item in files if item[0] not in keep]
 
     # Delete old files
-    for filepath, _ in files[keep_recent:]:
-        try:
-            os.remove(filepath)
-        except OSError:
-            pass
+    delete_files([filepath for filepath, _ in files])
 
 
 def get_file_size_mb(filepath: str) -> float:
@@ -72,16 +93,51 @@ def sanitize_filename(filename: str) -> str:
     return secure_filename(filename)
 
 
-def delete_files(file_paths: List[str]):
+def _remove_quietly(filepath: str):
+    """Remove a file, ignoring files that are already gone or locked."""
+    try:
+        os.remove(filepath)
+    except OSError:
+        pass
+
+
+def delete_files(file_paths: List[str], max_workers: int = 8):
     """
     Delete multiple files.
 
     Args:
         file_paths: List of file paths to delete
+        max_workers: Maximum number of deletes issued in parallel
+    """
+    if len(file_paths) <= 1:
+        for filepath in file_paths:
+            _remove_quietly(filepath)
+        return
+
+    # Unlinks block on the filesystem, not the GIL, so threads overlap them
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(file_paths))) as executor:
+        list(executor.map(_remove_quietly, file_paths))
+
+
+def write_stream(stream: BinaryIO, destination: str, buffer_size: int = 1024 * 1024):
+    """
+    Copy a stream to a file, replacing the destination only once complete.
+
+    The data goes to a temporary file next to ``destination`` and is renamed
+    into place on success, so an existing file is never truncated by a
+    failed transfer and readers never see a partial file.
+
+    Args:
+        stream: Readable binary stream
+        destination: Path of the file to create or replace
+        buffer_size: Block size used for copying
     """
-    for filepath in file_paths:
-        try:
-            if os.path.exists(filepath):
-                os.remove(filepath)
-        except OSError:
-            pass
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(destination), prefix=".upload-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            shutil.copyfileobj(stream, f, length=buffer_size)
+        os.chmod(tmp_path, DEFAULT_FILE_MODE)
+        os.replace(tmp_path, destination)
+    except BaseException:
+        _remove_quietly(tmp_path)
+        raise
@@ -0,0 +1,148 @@
+"""Parallel HTTP downloads for remote video inputs."""
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+# Files smaller than this are fetched over a single connection
+MIN_PARALLEL_SIZE = 8 * 1024 * 1024
+COPY_BUFFER_SIZE = 1024 * 1024
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def is_remote(path: str) -> bool:
+    """
+    Check whether a video path is an HTTP(S) URL.
+
+    Args:
+        path: Local path or URL
+
+    Returns:
+        True if the path should be downloaded first
+    """
+    return path.startswith(("http://", "https://"))
+
+
+def _origin(url: str) -> Tuple[str, Optional[str], Optional[int]]:
+    """Return the (scheme, host, port) a URL connects to."""
+    parts = urllib.parse.urlsplit(url)
+    return parts.scheme, parts.hostname, parts.port or _DEFAULT_PORTS.get(parts.scheme)
+
+
+class _SameOriginRedirectHandler(urllib.request.HTTPRedirectHandler):
+    """Follow redirects only within the scheme, host and port first requested."""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        """Refuse the redirect before any request is sent to another origin."""
+        if _origin(newurl) != _origin(req.full_url):
+            raise ValueError(f"Refusing redirect from {req.full_url} to {newurl}")
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+
+_opener = urllib.request.build_opener(_SameOriginRedirectHandler)
+
+
+def _urlopen(request: urllib.request.Request, timeout: float):
+    """Open a request, refusing redirects that leave the requested origin."""
+    return _opener.open(request, timeout=timeout)
+
+
+def _copy_limited(source, target, limit: Optional[int]) -> int:
+    """Copy ``source`` into ``target``, failing once more than ``limit`` bytes arrive."""
+    copied = 0
+    while True:
+        chunk = source.read(COPY_BUFFER_SIZE)
+        if not chunk:
+            return copied
+        copied += len(chunk)
+        if limit is not None and copied > limit:
+            raise ValueError(f"Download exceeds the limit of {limit} bytes")
+        target.write(chunk)
+
+
+def _probe(url: str, timeout: float) -> Tuple[Optional[int], bool]:
+    """Return the content length and whether byte ranges are supported."""
+    request = urllib.request.Request(url, method="HEAD")
+    try:
+        with _urlopen(request, timeout) as response:
+            length = response.headers.get("Content-Length")
+            accepts_ranges = response.headers.get("Accept-Ranges", "").lower() == "bytes"
+    except urllib.error.HTTPError as e:
+        if e.code not in (405, 501):
+            raise
+        # Server does not implement HEAD; a single GET will do
+        return None, False
+    return (int(length) if length else None), accepts_ranges
+
+
+def _fetch_range(url: str, destination: str, start: int, end: int, timeout: float):
+    """Download bytes ``start``-``end`` (inclusive) into the same offsets of ``destination``."""
+    request = urllib.request.Request(url, headers={"Range": f"bytes={start}-{end}"})
+    with _urlopen(request, timeout) as response:
+        if response.status != 206:
+            raise RuntimeError(f"Server ignored range request for {url}")
+        content_range = response.headers.get("Content-Range", "")
+        if not content_range.startswith(f"bytes {start}-{end}/"):
+            raise RuntimeError(f"Server sent range {content_range!r} for bytes {start}-{end} of {url}")
+        with open(destination, "r+b") as f:
+            f.seek(start)
+            received = _copy_limited(response, f, end - start + 1)
+        # A short body would leave a zero-filled gap in the pre-sized file
+        if received != end - start + 1:
+            raise RuntimeError(f"Range {start}-{end} of {url} ended after {received} bytes")
+
+
+def download_file(
+    url: str,
+    destination: str,
+    connections: int = 4,
+    timeout: float = 30.0,
+    max_size: Optional[int] = None,
+) -> str:
+    """
+    Download a URL, splitting it into parallel byte-range requests when possible.
+
+    Args:
+        url: HTTP(S) URL to download
+        destination: Local path to write to
+        connections: Maximum number of parallel connections
+        timeout: Socket timeout in seconds for each request
+        max_size: Largest accepted download in bytes (None for no limit)
+
+    Returns:
+        Path to the downloaded file
+
+    Raises:
+        ValueError: If the file is larger than ``max_size`` or redirects to another origin
+        RuntimeError: If a range request is not honored exactly by the server
+        OSError: If the download fails
+    """
+    length, accepts_ranges = _probe(url, timeout)
+    if max_size is not None and length is not None and length > max_size:
+        raise ValueError(f"Download of {length} bytes exceeds the limit of {max_size} bytes")
+
+    if not accepts_ranges or length is None or length < MIN_PARALLEL_SIZE or connections < 2:
+        with _urlopen(urllib.request.Request(url), timeout) as response:
+            with open(destination, "wb") as f:
+                _copy_limited(response, f, max_size)
+        return destination
+
+    # Size the file up front so each connection writes into its own region
+    with open(destination, "wb") as f:
+        f.truncate(length)
+
+    part_size = -(-length // connections)
+    ranges = [
+        (start, min(start + part_size, length) - 1) for start in range(0, length, part_size)
+    ]
+    with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+        futures = [
+            executor.submit(_fetch_range, url, destination, start, end, timeout)
+            for start, end in ranges
+        ]
+        for future in futures:
+            future.result()
+
+    return destination
@@ -9,55 +9,106 @@ with robust merging and real-time progress
 """
 
 import argparse
+import ctypes
+import ctypes.util
+import functools
 import json
 import os
 import shutil
 import subprocess
 import sys
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 
-def check_ffmpeg():
-    """Check if FFmpeg and FFprobe are available."""
+def _ffmpeg_cache_path():
+    """Location of the on-disk FFmpeg probe cache."""
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(
+        os.path.expanduser('~'), '.cache'
+    )
+    return os.path.join(cache_home, 'videomerger', 'ffmpeg.json')
+
+
+def _run_version(executable):
+    """Run `<executable> -version` and return its first line, or None."""
     try:
-        subprocess.run(
-            ['ffmpeg', '-version'],
-            capture_output=True,
-            text=True,
-            timeout=5,
-            check=True,
-        )
-        subprocess.run(
-            ['ffprobe', '-version'],
+        result = subprocess.run(
+            [executable, '-version'],
             capture_output=True,
             text=True,
             timeout=5,
             check=True,
         )
+        return result.stdout.split('\n')[0]
+    except Exception:
+        return None
+
+
+@functools.lru_cache(maxsize=1)
+def _probe_ffmpeg():
+    """Return (available, version_line) for the FFmpeg/FFprobe on PATH.
+
+    Results are cached in-process and on disk, keyed by the binaries'
+    paths and modification times, so repeated CLI invocations skip the
+    `-version` subprocesses until FFmpeg is replaced.
+    """
+    ffmpeg_path = shutil.which('ffmpeg')
+    ffprobe_path = shutil.which('ffprobe')
+    try:
+        key = [
+            [path, os.path.getmtime(path)]
+            for path in (ffmpeg_path, ffprobe_path)
+        ]
+    except (TypeError, OSError):
+        key = None
+
+    cache_path = _ffmpeg_cache_path()
+    if key is not None:
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as file_obj:
+                cached = json.load(file_obj)
+            if cached.get('key') == key:
+                return cached['available'], cached['version']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    version = _run_version(ffmpeg_path or 'ffmpeg')
+    available = version is not None and (
+        _run_version(ffprobe_path or 'ffprobe') is not None
+    )
+    version = version or 'unknown'
+
+    # Only remember a working install; a missing one may appear any time.
+    if key is not None and available:
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(cache_path, 'w', encoding='utf-8') as file_obj:
+                json.dump(
+                    {'key': key, 'available': available, 'version': version},
+                    file_obj,
+                )
+        except OSError:
+            pass
+
+    return available, version
+
+
+def check_ffmpeg():
+    """Check if FFmpeg and FFprobe are available."""
+    available, _ = _probe_ffmpeg()
+    if available:
         print('FFmpeg and FFprobe available')
         return True
-    except Exception:
-        print('FFmpeg/FFprobe not available', file=sys.stderr)
-        return False
+    print('FFmpeg/FFprobe not available', file=sys.stderr)
+    return False
 
 
 def get_ffmpeg_version():
     """Get FFmpeg version."""
-    try:
-        result = subprocess.run(
-            ['ffmpeg', '-version'],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        if result.returncode == 0:
-            version_line = result.stdout.split('\n')[0]
-            print(version_line)
-            return version_line
-    except Exception:
-        pass
-    print('unknown')
-    return 'unknown'
+    _, version_line = _probe_ffmpeg()
+    print(version_line)
+    return version_line
 
 
 def _get_total_duration(video_paths):
@@ -107,17 +158,39 @@ def _parse_time_from_ffmpeg(line):
     return None
 
 
-def _get_video_properties(video_path):
-    """Get width, height, and framerate of a video using ffprobe."""
+# FFprobe codec_name for each codec option accepted by merge_videos.
+_PROBE_CODEC_NAMES = {
+    'H.264': 'h264',
+    'H.265': 'hevc',
+    'VP8': 'vp8',
+    'VP9': 'vp9',
+    'AV1': 'av1',
+}
+
+
+def probe_video(video_path):
+    """Read everything merge_videos needs about a clip with one ffprobe call.
+
+    Returns a dict with width, height, fps, duration, has_audio and the
+    stream-copy signature. Fields that cannot be read fall back to the
+    same defaults the individual probes used.
+    """
+    info = {
+        'width': 1920,
+        'height': 1080,
+        'fps': 30.0,
+        'duration': 0.0,
+        'has_audio': False,
+        'signature': None,
+    }
     try:
         cmd = [
             'ffprobe',
             '-v',
             'error',
-            '-select_streams',
-            'v:0',
             '-show_entries',
-            'stream=width,height,r_frame_rate',
+            'stream=codec_type,codec_name,width,height,r_frame_rate,'
+            'pix_fmt,sample_rate,channels:format=duration',
             '-of',
             'json',
             video_path,
@@ -128,77 +201,279 @@ def _get_video_properties(video_path):
             stderr=subprocess.PIPE,
             text=True,
         )
-        info = json.loads(result.stdout)
-        stream = info['streams'][0]
+        probe = json.loads(result.stdout)
+    except Exception as e:
+        print(
+            f'WARNING: Could not probe {video_path}: {e}',
+            file=sys.stderr,
+        )
+        return info
 
-        width = int(stream['width'])
-        height = int(stream['height'])
+    try:
+        info['duration'] = float(probe['format']['duration'])
+    except Exception:
+        pass
+
+    streams = probe.get('streams', [])
+    audio = next(
+        (s for s in streams if s.get('codec_type') == 'audio'),
+        None,
+    )
+    info['has_audio'] = audio is not None
+    audio = audio or {}
+
+    try:
+        video = next(s for s in streams if s.get('codec_type') == 'video')
+        width = int(video['width'])
+        height = int(video['height'])
 
-        fps_str = stream.get('r_frame_rate', '30/1')
+        fps_str = video.get('r_frame_rate', '30/1')
         num, den = map(int, fps_str.split('/'))
         fps = num / den if den != 0 else 30.0
-
-        return width, height, fps
     except Exception as e:
         print(
             f'WARNING: Could not read properties for {video_path}: {e}',
             file=sys.stderr,
         )
-        return 1920, 1080, 30.0
+        return info
+
+    info.update(width=width, height=height, fps=fps)
+    info['signature'] = (
+        video.get('codec_name'),
+        width,
+        height,
+        video.get('r_frame_rate'),
+        video.get('pix_fmt'),
+        audio.get('codec_name'),
+        audio.get('sample_rate'),
+        audio.get('channels'),
+    )
+    return info
 
 
-def _has_audio(video_path):
-    """Return True if the input contains an audio stream."""
-    try:
-        cmd = [
-            'ffprobe',
-            '-v',
-            'error',
-            '-select_streams',
-            'a:0',
-            '-show_entries',
-            'stream=codec_type',
-            '-of',
-            'default=noprint_wrappers=1:nokey=1',
-            video_path,
+def can_stream_copy(probes, codec=None):
+    """Return True if probed inputs can be concatenated without re-encoding.
+
+    With `codec` set, the inputs must also already be in that codec;
+    otherwise any codec they share is accepted.
+    """
+    signatures = {probe['signature'] for probe in probes}
+    if len(signatures) != 1:
+        return False
+    signature = signatures.pop()
+    return signature is not None and (
+        codec is None or signature[0] == _PROBE_CODEC_NAMES.get(codec, 'h264')
+    )
+
+
+def build_concat_list(paths):
+    """Return a concat demuxer list for `paths`, to be fed on stdin."""
+    return ''.join(
+        # The concat list uses shell-like quoting for paths.
+        "file '{}'\n".format(os.path.abspath(path).replace("'", "'\\''"))
+        for path in paths
+    )
+
+
+# Hardware encoders to try for each codec option, in order of preference.
+_HW_ENCODERS = {
+    'H.264': ['h264_nvenc', 'h264_qsv', 'h264_videotoolbox', 'h264_vaapi'],
+    'H.265': ['hevc_nvenc', 'hevc_qsv', 'hevc_videotoolbox', 'hevc_vaapi'],
+}
+_VAAPI_DEVICE = '/dev/dri/renderD128'
+
+
+def _hw_encoder_args(encoder, quality):
+    """Return (global_args, filter_suffix, codec_args) for a hardware encoder.
+
+    Quality levels mirror the CRF values used for the software encoders.
+    """
+    level = quality if quality in ('low', 'medium', 'high') else 'medium'
+    cq = {'low': '28', 'medium': '23', 'high': '18'}[level]
+
+    if encoder.endswith('_nvenc'):
+        preset = {'low': 'p1', 'medium': 'p5', 'high': 'p7'}[level]
+        return [], '', [
+            '-c:v', encoder, '-preset', preset, '-rc', 'vbr',
+            '-cq', cq, '-b:v', '0',
+        ]
+    if encoder.endswith('_qsv'):
+        preset = {'low': 'veryfast', 'medium': 'medium', 'high': 'slow'}[level]
+        return [], '', [
+            '-c:v', encoder, '-preset', preset, '-global_quality', cq,
         ]
+    if encoder.endswith('_videotoolbox'):
+        # VideoToolbox uses a 1-100 scale where higher is better.
+        q = {'low': '50', 'medium': '65', 'high': '80'}[level]
+        return [], '', ['-c:v', encoder, '-q:v', q]
+    if encoder.endswith('_vaapi'):
+        # VAAPI encodes from GPU surfaces, so frames are uploaded after
+        # the software filter chain.
+        return (
+            ['-vaapi_device', _VAAPI_DEVICE],
+            ',format=nv12,hwupload',
+            ['-c:v', encoder, '-qp', cq],
+        )
+    return [], '', ['-c:v', encoder]
+
+
+@functools.lru_cache(maxsize=None)
+def _select_hw_encoder(codec):
+    """Return the first hardware encoder for `codec` that actually works.
+
+    An encoder being compiled into FFmpeg does not mean the matching GPU
+    or driver is present, so each candidate is checked with a tiny test
+    encode. Returns None if no hardware encoder is usable.
+    """
+    candidates = _HW_ENCODERS.get(codec, [])
+    if not candidates:
+        return None
+
+    try:
         result = subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            ['ffmpeg', '-hide_banner', '-encoders'],
+            capture_output=True,
             text=True,
+            timeout=10,
         )
-        return result.returncode == 0 and bool(result.stdout.strip())
-    except Exception as e:
-        print(
-            f'WARNING: Could not detect audio stream for {video_path}: {e}',
-            file=sys.stderr,
+    except Exception:
+        return None
+    listed = set()
+    for line in result.stdout.splitlines():
+        fields = line.split()
+        if len(fields) >= 2:
+            listed.add(fields[1])
+
+    for encoder in candidates:
+        if encoder not in listed:
+            continue
+        global_args, filter_suffix, codec_args = _hw_encoder_args(
+            encoder, 'medium'
         )
-        return False
+        cmd = ['ffmpeg', '-hide_banner', '-nostdin', '-v', 'error']
+        cmd.extend(global_args)
+        cmd.extend([
+            '-f',
+            'lavfi',
+            '-i',
+            'color=size=256x256:duration=0.1',
+            '-vf',
+            f'format=yuv420p{filter_suffix}',
+        ])
+        cmd.extend(codec_args)
+        cmd.extend(['-f', 'null', '-'])
+        try:
+            probe = subprocess.run(
+                cmd,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                stdin=subprocess.DEVNULL,
+                timeout=15,
+            )
+        except Exception:
+            continue
+        if probe.returncode == 0:
+            return encoder
+    return None
+
 
+# fallocate(2) flag: reserve blocks without changing the file size.
+_FALLOC_FL_KEEP_SIZE = 0x01
 
-def _get_duration(video_path):
-    """Get duration of a single video in seconds."""
+
+def _preallocate(path, size):
+    """Reserve `size` bytes of contiguous space for a new, empty `path`.
+
+    Uses fallocate(2) with FALLOC_FL_KEEP_SIZE, so the file stays 0 bytes
+    long and FFmpeg writes into the reserved extents as it goes. Plain
+    posix_fallocate would grow the file, and FFmpeg's truncate-on-open
+    would throw the reservation away. Linux only; returns True if the
+    space was reserved.
+    """
+    if not sys.platform.startswith('linux') or size <= 0:
+        return False
     try:
-        cmd = [
-            'ffprobe',
-            '-v',
-            'error',
-            '-show_entries',
-            'format=duration',
-            '-of',
-            'default=noprint_wrappers=1:nokey=1',
-            video_path,
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        fallocate = getattr(libc, 'fallocate64', libc.fallocate)
+        fallocate.argtypes = [
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int64,
+            ctypes.c_int64,
         ]
-        result = subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-        return float(result.stdout.strip())
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            return fallocate(fd, _FALLOC_FL_KEEP_SIZE, 0, size) == 0
+        finally:
+            os.close(fd)
     except Exception:
-        return 0.0
+        return False
+
+
+def _concat_copy(paths, output_path):
+    """Concatenate already-compatible files with the concat demuxer."""
+    # Feed the concat list on stdin so no list file is written, and
+    # concurrent merges cannot trip over each other's lists.
+    concat_list = build_concat_list(paths)
+
+    concat_cmd = [
+        'ffmpeg',
+        '-y',
+        '-hide_banner',
+        '-nostdin',
+        '-f',
+        'concat',
+        '-safe',
+        '0',
+        '-protocol_whitelist',
+        'file,pipe',
+        '-i',
+        'pipe:0',
+        '-c',
+        'copy',
+    ]
+
+    # Stream copy output is about the size of its inputs; reserving that
+    # up front keeps the file in few extents for fast range reads later.
+    try:
+        estimated_size = sum(os.path.getsize(path) for path in paths)
+    except OSError:
+        estimated_size = 0
+    preallocated = _preallocate(output_path, estimated_size)
+    if preallocated:
+        # Write into the reserved blocks instead of truncating them away.
+        concat_cmd.extend(['-truncate', '0'])
+    concat_cmd.append(output_path)
+
+    result = subprocess.run(
+        concat_cmd,
+        input=concat_list.encode('utf-8'),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+
+    if result.returncode == 0:
+        if preallocated:
+            # Release any reserved blocks past the end of the output.
+            try:
+                os.truncate(output_path, os.path.getsize(output_path))
+            except OSError:
+                pass
+        print('PROGRESS: 100', flush=True)
+        print(f'\nSUCCESS: Merged videos to {output_path}')
+        return True
+
+    if preallocated:
+        # A partial output is useless; drop it along with its reservation.
+        try:
+            os.remove(output_path)
+        except OSError:
+            pass
+    print(
+        f'\nERROR: Concat failed with exit code {result.returncode}',
+        file=sys.stderr,
+    )
+    return False
 
 
 def _parse_time_from_progress(line):
@@ -213,6 +488,28 @@ def _parse_time_from_progress(line):
     return None
 
 
+def _select_baseline(probes):
+    """Return the (width, height, fps) every clip is normalized to.
+
+    The smallest frame size and the lowest frame rate win, so no clip is
+    upscaled or has frames invented.
+    """
+    lowest_area = float('inf')
+    target_width, target_height, target_fps = 1920, 1080, 60.0
+
+    for probe in probes:
+        width, height, fps = probe['width'], probe['height'], probe['fps']
+        if (width * height) < lowest_area:
+            lowest_area = width * height
+            target_width, target_height = width, height
+        if fps < target_fps:
+            target_fps = fps
+
+    target_width -= target_width % 2
+    target_height -= target_height % 2
+    return target_width, target_height, round(target_fps, 2)
+
+
 def merge_videos(
     input_paths,
     output_path,
@@ -220,6 +517,8 @@ def merge_videos(
     codec='H.264',
     overwrite=False,
     disable_hwaccel=True,
+    max_jobs=None,
+    hw_accel='none',
 ):
     """Normalize clips and concatenate them into a single output video."""
     if len(input_paths) < 2:
@@ -229,21 +528,25 @@ def merge_videos(
     # Keep absolute output path before changing the working directory.
     output_path = os.path.abspath(output_path)
 
-    print('INFO: Analyzing videos to find optimal baseline...')
-    lowest_area = float('inf')
-    target_width, target_height, target_fps = 1920, 1080, 60.0
+    # One ffprobe per clip covers the stream-copy check, baseline,
+    # durations and audio detection below.
+    probes = [probe_video(path) for path in input_paths]
 
-    for path in input_paths:
-        width, height, fps = _get_video_properties(path)
-        if (width * height) < lowest_area:
-            lowest_area = width * height
-            target_width, target_height = width, height
-        if fps < target_fps:
-            target_fps = fps
+    # Inputs that already share codec and stream parameters only need their
+    # packets joined, which skips decoding and encoding entirely.
+    if can_stream_copy(probes, codec):
+        print('INFO: Inputs are compatible, concatenating with stream copy...')
+        if _concat_copy(input_paths, output_path):
+            return True
+        # Matching stream parameters do not guarantee the packets join
+        # cleanly (e.g. differing extradata), so re-encode instead.
+        print(
+            'WARNING: Stream copy failed, falling back to re-encoding',
+            file=sys.stderr,
+        )
 
-    target_width -= target_width % 2
-    target_height -= target_height % 2
-    target_fps = round(target_fps, 2)
+    print('INFO: Analyzing videos to find optimal baseline...')
+    target_width, target_height, target_fps = _select_baseline(probes)
     target_audio_rate = 48000
 
     print(
@@ -252,9 +555,13 @@ def merge_videos(
     )
 
     # Maintain smooth 0-100 progress tracking across all clips.
-    durations = [_get_duration(path) for path in input_paths]
+    durations = [probe['duration'] for probe in probes]
     total_duration = sum(durations)
-    accumulated_duration = 0.0
+    clip_progress = [0.0] * len(input_paths)
+    # Highest percentage printed so far; a software retry must not move
+    # the reported progress backwards.
+    reported_progress = [0]
+    progress_lock = threading.Lock()
 
     codec_map = {
         'H.264': 'libx264',
@@ -270,133 +577,142 @@ def merge_videos(
         'high': ['-crf', '18', '-preset', 'slow'],
     }
 
-    temp_dir = tempfile.mkdtemp(prefix='video_proc_')
-    normalized_files = []
+    hw_encoder = _select_hw_encoder(codec) if hw_accel == 'auto' else None
+    if hw_encoder:
+        print(f'INFO: Using hardware encoder {hw_encoder}')
+    elif hw_accel == 'auto':
+        print('INFO: No hardware encoder available, encoding in software')
 
-    try:
-        print('INFO: Starting Pass 1 (Normalizing clips sequentially)...')
-
-        for index, path in enumerate(input_paths):
-            temp_filename = f'norm_{index}.mp4'
-            temp_filepath = os.path.join(temp_dir, temp_filename)
-            normalized_files.append(temp_filename)
-
-            filter_v = (
-                f'scale={target_width}:{target_height}:'
-                'force_original_aspect_ratio=decrease,'
-                f'pad={target_width}:{target_height}:(ow-iw)/2:(oh-ih)/2,'
-                f'fps={target_fps},format=yuv420p'
+    temp_dir = tempfile.mkdtemp(prefix='video_proc_')
+    normalized_files = [
+        os.path.join(temp_dir, f'norm_{index}.mp4')
+        for index in range(len(input_paths))
+    ]
+
+    def normalize(index, encoder):
+        """Re-encode one clip to the baseline; return True on success."""
+        path = input_paths[index]
+        if encoder:
+            global_args, filter_suffix, video_args = _hw_encoder_args(
+                encoder, quality
+            )
+        else:
+            global_args, filter_suffix = [], ''
+            video_args = ['-c:v', ffmpeg_codec] + quality_settings.get(
+                quality, quality_settings['medium']
             )
 
-            cmd = ['ffmpeg', '-y', '-hide_banner', '-nostdin']
-            if disable_hwaccel:
-                cmd.extend(['-hwaccel', 'none'])
+        filter_v = (
+            f'scale={target_width}:{target_height}:'
+            'force_original_aspect_ratio=decrease,'
+            f'pad={target_width}:{target_height}:(ow-iw)/2:(oh-ih)/2,'
+            f'fps={target_fps},format=yuv420p{filter_suffix}'
+        )
 
-            cmd.extend(['-i', path])
+        cmd = ['ffmpeg', '-y', '-hide_banner', '-nostdin']
+        cmd.extend(global_args)
+        if disable_hwaccel:
+            cmd.extend(['-hwaccel', 'none'])
 
-            has_audio = _has_audio(path)
-            if has_audio:
-                filter_a = (
-                    'aformat=sample_rates='
-                    f'{target_audio_rate}:channel_layouts=stereo'
-                )
-                filter_str = f'[0:v]{filter_v}[outv]; [0:a]{filter_a}[outa]'
-            else:
-                filter_str = (
-                    f'[0:v]{filter_v}[outv]; '
-                    f'anullsrc=r={target_audio_rate}:cl=stereo[outa]'
-                )
+        cmd.extend(['-i', path])
 
-            cmd.extend([
-                '-filter_complex',
-                filter_str,
-                '-map',
-                '[outv]',
-                '-map',
-                '[outa]',
-            ])
-            cmd.extend(['-c:v', ffmpeg_codec])
-            cmd.extend(
-                quality_settings.get(quality, quality_settings['medium'])
+        has_audio = probes[index]['has_audio']
+        if has_audio:
+            filter_a = (
+                'aformat=sample_rates='
+                f'{target_audio_rate}:channel_layouts=stereo'
             )
-            cmd.extend(['-c:a', 'aac', '-b:a', '192k'])
-
-            # If we synthesize audio via anullsrc, stop output when video ends.
-            if not has_audio:
-                cmd.append('-shortest')
-
-            cmd.extend(['-progress', 'pipe:1', temp_filepath])
-
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                stdin=subprocess.DEVNULL,
-                universal_newlines=True,
-                encoding='utf-8',
+            filter_str = f'[0:v]{filter_v}[outv]; [0:a]{filter_a}[outa]'
+        else:
+            filter_str = (
+                f'[0:v]{filter_v}[outv]; '
+                f'anullsrc=r={target_audio_rate}:cl=stereo[outa]'
             )
 
-            for line in process.stdout:
-                current_time = _parse_time_from_progress(line)
-                if current_time is not None and total_duration > 0:
-                    overall_time = accumulated_duration + current_time
-                    percentage = min(
-                        int((overall_time / total_duration) * 100),
-                        100,
-                    )
-                    print(f'PROGRESS: {percentage}', flush=True)
+        cmd.extend([
+            '-filter_complex',
+            filter_str,
+            '-map',
+            '[outv]',
+            '-map',
+            '[outa]',
+        ])
+        cmd.extend(video_args)
+        cmd.extend(['-c:a', 'aac', '-b:a', '192k'])
 
-            process.wait()
-            if process.returncode != 0:
-                print(
-                    f'ERROR: Failed to normalize video {path}',
-                    file=sys.stderr,
-                )
-                return False
-
-            accumulated_duration += durations[index]
-
-        print('\nINFO: Starting Pass 2 (Zero-RAM fast concatenation)...')
-        list_file_path = os.path.join(temp_dir, 'files.txt')
+        # If we synthesize audio via anullsrc, stop output when video ends.
+        if not has_audio:
+            cmd.append('-shortest')
 
-        with open(list_file_path, 'w', encoding='utf-8') as file_obj:
-            for normalized in normalized_files:
-                file_obj.write(f"file '{normalized}'\n")
+        cmd.extend(['-progress', 'pipe:1', normalized_files[index]])
 
-        concat_cmd = [
-            'ffmpeg',
-            '-y',
-            '-hide_banner',
-            '-nostdin',
-            '-f',
-            'concat',
-            '-safe',
-            '0',
-            '-i',
-            'files.txt',
-            '-c',
-            'copy',
-            output_path,
-        ]
-
-        result = subprocess.run(
-            concat_cmd,
+        process = subprocess.Popen(
+            cmd,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             stdin=subprocess.DEVNULL,
-            cwd=temp_dir,
+            universal_newlines=True,
+            encoding='utf-8',
         )
 
-        if result.returncode == 0:
-            print('PROGRESS: 100', flush=True)
-            print(f'\nSUCCESS: Merged videos to {output_path}')
-            return True
+        for line in process.stdout:
+            current_time = _parse_time_from_progress(line)
+            if current_time is not None and total_duration > 0:
+                with progress_lock:
+                    clip_progress[index] = min(current_time, durations[index])
+                    percentage = min(
+                        int((sum(clip_progress) / total_duration) * 100),
+                        100,
+                    )
+                    if percentage > reported_progress[0]:
+                        reported_progress[0] = percentage
+                        print(f'PROGRESS: {percentage}', flush=True)
 
+        process.wait()
+        if process.returncode != 0:
+            print(
+                f'ERROR: Failed to normalize video {path}',
+                file=sys.stderr,
+            )
+            return False
+        return True
+
+    try:
+        # Each clip is an independent FFmpeg process, so threads are enough
+        # to keep several encoders busy at once.
+        if max_jobs is None:
+            max_jobs = os.cpu_count() or 1
+        workers = max(1, min(max_jobs, len(input_paths)))
         print(
-            f'\nERROR: Concat failed with exit code {result.returncode}',
-            file=sys.stderr,
+            'INFO: Starting Pass 1 '
+            f'(Normalizing clips, {workers} at a time)...'
         )
-        return False
+
+        def normalize_all(encoder):
+            indexes = range(len(input_paths))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return all(executor.map(
+                    normalize, indexes, [encoder] * len(indexes)
+                ))
+
+        normalized = normalize_all(hw_encoder)
+        if not normalized and hw_encoder:
+            # Hardware sessions can run out when clips encode in parallel.
+            # Re-encode every clip in software: mixing hardware and software
+            # parameter sets would break the stream-copy concat below.
+            print(
+                f'WARNING: {hw_encoder} failed, '
+                're-encoding all clips in software',
+                file=sys.stderr,
+            )
+            with progress_lock:
+                clip_progress[:] = [0.0] * len(input_paths)
+            normalized = normalize_all(None)
+        if not normalized:
+            return False
+
+        print('\nINFO: Starting Pass 2 (Zero-RAM fast concatenation)...')
+        return _concat_copy(normalized_files, output_path)
 
     finally:
         shutil.rmtree(temp_dir, ignore_errors=True)
@@ -444,6 +760,21 @@ def main():
         ),
     )
 
+    parser.add_argument(
+        '--hw-accel',
+        choices=['auto', 'none'],
+        default='none',
+        help=(
+            'Encode with a hardware encoder (NVENC, QSV, VideoToolbox, '
+            'VAAPI) when one is available'
+        ),
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        help='Maximum clips to re-encode in parallel (default: CPU count)',
+    )
+
     args = parser.parse_args()
 
     if args.ffmpeg_path:
@@ -474,6 +805,8 @@ def main():
             args.codec,
             args.overwrite,
             disable_hwaccel=not args.allow_hwaccel,
+            max_jobs=args.jobs,
+            hw_accel=args.hw_accel,
         )
         sys.exit(0 if success else 1)
 
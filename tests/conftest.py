@@ -7,22 +7,15 @@ from videomerger.utils.config import TestingConfig
 
 
 @pytest.fixture
-def app():
+def app(tmp_path):
     """Create and configure a test application instance."""
-    app = create_app(TestingConfig)
-    
-    # Create temporary directories for testing
-    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-    os.makedirs(app.config['OUTPUT_FOLDER'], exist_ok=True)
-    
-    yield app
-    
-    # Cleanup
-    import shutil
-    if os.path.exists(app.config['UPLOAD_FOLDER']):
-        shutil.rmtree(app.config['UPLOAD_FOLDER'])
-    if os.path.exists(app.config['OUTPUT_FOLDER']):
-        shutil.rmtree(app.config['OUTPUT_FOLDER'])
+    # Per-test directories keep tests isolated so they can run in parallel
+    class Config(TestingConfig):
+        UPLOAD_FOLDER = str(tmp_path / 'uploads')
+        OUTPUT_FOLDER = str(tmp_path / 'outputs')
+        JOB_FOLDER = str(tmp_path / 'jobs')
+
+    return create_app(Config)
 
 
 @pytest.fixture
@@ -1,5 +1,14 @@
 """Unit tests for the Flask application."""
+import datetime
+import io
 import json
+import os
+import time
+
+import pytest
+
+from videomerger.app import allowed_file
+from videomerger.utils.file_utils import DEFAULT_FILE_MODE
 
 
 def test_index_route(client):
@@ -35,7 +44,290 @@ def test_merge_no_data(client):
     assert 'error' in data
 
 
+def test_merge_remote_inputs_disabled(client):
+    """Test merge rejects URLs unless remote inputs are enabled."""
+    response = client.post('/api/merge', json={
+        'files': ['http://127.0.0.1/a.mp4', 'http://127.0.0.1/b.mp4'],
+    })
+    assert response.status_code == 400
+    assert 'disabled' in json.loads(response.data)['error']
+
+
 def test_download_nonexistent_file(client):
     """Test downloading a file that doesn't exist."""
     response = client.get('/api/download/nonexistent.mp4')
     assert response.status_code == 404
+
+
+def test_stream_upload(client, app):
+    """Test streaming a raw video body to the upload folder."""
+    response = client.put('/api/upload/clip.mp4', data=b'fake video content')
+    assert response.status_code == 201
+    data = json.loads(response.data)
+    with open(data['file'], 'rb') as f:
+        assert f.read() == b'fake video content'
+
+
+def test_stream_upload_invalid_type(client):
+    """Test streaming upload rejects unsupported extensions."""
+    response = client.put('/api/upload/notes.txt', data=b'not a video')
+    assert response.status_code == 400
+
+
+def test_merge_runs_in_background(client, app):
+    """Test merge returns a job id and reports completion via status."""
+    paths = []
+    for name in ('a.mp4', 'b.mp4'):
+        path = os.path.join(app.config['UPLOAD_FOLDER'], name)
+        with open(path, 'wb') as f:
+            f.write(b'fake video content')
+        paths.append(path)
+
+    response = client.post('/api/merge', json={'files': paths, 'output_name': 'out.mp4'})
+    assert response.status_code == 202
+    job_id = json.loads(response.data)['job_id']
+
+    for _ in range(50):
+        data = json.loads(client.get(f'/api/status/{job_id}').data)
+        if data['status'] in ('completed', 'failed'):
+            break
+        time.sleep(0.05)
+    assert data['status'] == 'completed'
+    assert os.path.exists(data['output_file'])
+
+
+def test_status_unknown_job(client):
+    """Test status endpoint for a job that doesn't exist."""
+    response = client.get('/api/status/not-a-job')
+    assert response.status_code == 404
+
+
+def test_download_range_request(client, app):
+    """Test downloads honor Range headers with a partial response."""
+    with open(os.path.join(app.config['OUTPUT_FOLDER'], 'merged.mp4'), 'wb') as f:
+        f.write(b'0123456789')
+
+    response = client.get('/api/download/merged.mp4', headers={'Range': 'bytes=2-5'})
+    assert response.status_code == 206
+    assert response.data == b'2345'
+    assert response.headers['Content-Range'] == 'bytes 2-5/10'
+    assert response.headers['Accept-Ranges'] == 'bytes'
+    assert 'ETag' in response.headers
+
+
+def test_download_x_accel_redirect(client, app):
+    """Test downloads are delegated to the proxy when configured."""
+    app.config['X_ACCEL_REDIRECT_PREFIX'] = '/protected'
+    with open(os.path.join(app.config['OUTPUT_FOLDER'], 'merged.mp4'), 'wb') as f:
+        f.write(b'0123456789')
+
+    response = client.get('/api/download/merged.mp4')
+    assert response.status_code == 200
+    assert response.headers['X-Accel-Redirect'] == '/protected/merged.mp4'
+    assert response.data == b''
+
+
+def test_upload_multipart(client, app):
+    """Test multipart uploads land in the upload folder without spool leftovers."""
+    response = client.post(
+        '/api/upload',
+        data={
+            'videos': [
+                (io.BytesIO(b'first video'), 'a.mp4'),
+                (io.BytesIO(b'second video'), 'b.mp4'),
+                (io.BytesIO(b'not a video'), 'notes.txt'),
+            ]
+        },
+        content_type='multipart/form-data',
+    )
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['count'] == 2
+    assert sorted(os.listdir(app.config['UPLOAD_FOLDER'])) == ['a.mp4', 'b.mp4']
+    mode = os.stat(os.path.join(app.config['UPLOAD_FOLDER'], 'a.mp4')).st_mode
+    assert mode & 0o777 == DEFAULT_FILE_MODE
+
+
+def test_allowed_file():
+    """Test extension checks on uploaded filenames."""
+    assert allowed_file('clip.MP4')
+    assert allowed_file('archive.tar.webm')
+    assert not allowed_file('clip')
+    assert not allowed_file('clip.txt')
+    assert not allowed_file('mp4')
+
+
+def test_stream_merge_insufficient_files(client):
+    """Test streaming merge rejects fewer than 2 videos."""
+    response = client.post('/api/merge/stream', json={'files': ['only.mp4']})
+    assert response.status_code == 400
+    data = json.loads(response.data)
+    assert 'error' in data
+
+
+class KeepValueBytesIO(io.BytesIO):
+    """BytesIO that remembers what was written after it is closed."""
+
+    def close(self):
+        self.written = self.getvalue()
+        super().close()
+
+
+class FakeFFmpeg:
+    """Stand-in for the FFmpeg process behind a streaming merge."""
+
+    instances = []
+
+    def __init__(self, cmd, **kwargs):
+        self.stdin = KeepValueBytesIO()
+        self.stdout = io.BytesIO(b'0123456789' * 10)
+        self.stderr = io.BytesIO(b'')
+        self.returncode = None
+        self.killed = False
+        FakeFFmpeg.instances.append(self)
+
+    def poll(self):
+        if self.returncode is None and self.stdout.tell() == len(self.stdout.getvalue()):
+            self.returncode = 0
+        return self.returncode
+
+    def kill(self):
+        self.killed = True
+        self.returncode = -9
+
+    def wait(self):
+        return self.returncode
+
+
+@pytest.fixture
+def stream_inputs(app, monkeypatch):
+    """Two input files with matching probes and a mocked FFmpeg."""
+    from videomerger.core import video_processor
+
+    FakeFFmpeg.instances = []
+    monkeypatch.setattr(video_processor.subprocess, 'Popen', FakeFFmpeg)
+    monkeypatch.setattr(
+        video_processor, 'probe_video',
+        lambda path: {'signature': ('h264', 640, 360, '30/1', 'yuv420p', 'aac', '48000', 2)}
+    )
+    paths = []
+    for name in ('a.mp4', 'b.mp4'):
+        path = os.path.join(app.config['UPLOAD_FOLDER'], name)
+        with open(path, 'wb') as f:
+            f.write(b'fake video content')
+        paths.append(path)
+    return paths
+
+
+def test_stream_merge_streams_output(client, app, stream_inputs):
+    """Test streaming merge sends FFmpeg's stdout as the response body."""
+    app.config['COPY_BUFFER_SIZE'] = 16
+    response = client.post('/api/merge/stream', json={'files': stream_inputs})
+    assert response.status_code == 200
+    assert response.mimetype == 'video/mp4'
+    assert response.data == b'0123456789' * 10
+
+    process = FakeFFmpeg.instances[0]
+    assert not process.killed
+    assert b"a.mp4'" in process.stdin.written
+
+
+def test_stream_merge_kills_ffmpeg_on_disconnect(client, app, stream_inputs):
+    """Test closing the response early stops FFmpeg."""
+    app.config['COPY_BUFFER_SIZE'] = 16
+    response = client.post(
+        '/api/merge/stream', json={'files': stream_inputs}, buffered=False
+    )
+    assert next(response.iter_encoded()) == b'0123456789012345'
+    response.close()
+
+    assert FakeFFmpeg.instances[0].killed
+
+
+def test_stream_merge_logs_ffmpeg_errors(client, stream_inputs, monkeypatch, caplog):
+    """Test a failed FFmpeg run logs its stderr."""
+    def failing(cmd, **kwargs):
+        process = FakeFFmpeg(cmd, **kwargs)
+        process.stdout = io.BytesIO(b'')
+        process.stderr = io.BytesIO(b'Non-monotonic DTS')
+        process.returncode = 1
+        return process
+
+    from videomerger.core import video_processor
+    monkeypatch.setattr(video_processor.subprocess, 'Popen', failing)
+
+    client.post('/api/merge/stream', json={'files': stream_inputs})
+
+    assert 'Non-monotonic DTS' in caplog.text
+
+
+def test_stream_merge_rejects_mismatched_inputs(client, stream_inputs, monkeypatch):
+    """Test streaming merge refuses inputs that cannot be stream copied."""
+    from videomerger.core import video_processor
+
+    sizes = iter([640, 1280])
+    monkeypatch.setattr(
+        video_processor, 'probe_video',
+        lambda path: {'signature': ('h264', next(sizes), 360, '30/1', 'yuv420p', 'aac', '48000', 2)}
+    )
+
+    response = client.post('/api/merge/stream', json={'files': stream_inputs})
+    assert response.status_code == 400
+    assert FakeFFmpeg.instances == []
+
+
+def test_stream_merge_rejects_codecs_mp4_cannot_carry(client, stream_inputs, monkeypatch):
+    """Test streaming merge refuses matching inputs whose codecs MP4 cannot hold."""
+    from videomerger.core import video_processor
+
+    monkeypatch.setattr(
+        video_processor, 'probe_video',
+        lambda path: {'signature': ('vp8', 640, 360, '30/1', 'yuv420p', 'vorbis', '48000', 2)}
+    )
+
+    response = client.post('/api/merge/stream', json={'files': stream_inputs})
+    assert response.status_code == 400
+    assert 'vp8/vorbis' in json.loads(response.data)['error']
+    assert FakeFFmpeg.instances == []
+
+
+def test_stream_merge_rejects_files_outside_upload_folder(client, app, stream_inputs):
+    """Test streaming merge only reads files from the upload folder."""
+    outside = os.path.join(app.config['OUTPUT_FOLDER'], 'private.mp4')
+    with open(outside, 'wb') as f:
+        f.write(b'another client video')
+    escaped = os.path.join(app.config['UPLOAD_FOLDER'], '..', 'outputs', 'private.mp4')
+    linked = os.path.join(app.config['UPLOAD_FOLDER'], 'link.mp4')
+    os.symlink(outside, linked)
+
+    for path in (outside, escaped, linked):
+        response = client.post('/api/merge/stream', json={'files': [stream_inputs[0], path]})
+        assert response.status_code == 400
+        assert 'outside the upload folder' in json.loads(response.data)['error']
+    assert FakeFFmpeg.instances == []
+
+
+def test_json_provider_matches_flask_output(app):
+    """Test the JSON provider sorts keys and formats dates like Flask."""
+    pytest.importorskip('orjson')
+    data = {'b': 1, 'a': datetime.datetime(2024, 1, 2, 3, 4, 5)}
+    assert app.json.dumps(data) == '{"a":"Tue, 02 Jan 2024 03:04:05 GMT","b":1}'
+    assert app.json.loads(b'{"files": ["a.mp4"]}') == {'files': ['a.mp4']}
+
+
+def test_stream_upload_hostile_name(client):
+    """Test streaming upload rejects names that sanitize to no extension."""
+    response = client.put('/api/upload/..mp4', data=b'fake video content')
+    assert response.status_code == 400
+
+
+def test_stream_upload_failure_keeps_existing_file(client, app):
+    """Test a rejected streaming upload leaves an earlier upload intact."""
+    client.put('/api/upload/clip.mp4', data=b'good video')
+    app.config['MAX_CONTENT_LENGTH'] = 4
+
+    response = client.put('/api/upload/clip.mp4', data=b'too large video')
+    assert response.status_code == 413
+    with open(os.path.join(app.config['UPLOAD_FOLDER'], 'clip.mp4'), 'rb') as f:
+        assert f.read() == b'good video'
+    assert os.listdir(app.config['UPLOAD_FOLDER']) == ['clip.mp4']
@@ -0,0 +1,83 @@
+"""Unit tests for file handling utilities."""
+import io
+import os
+
+from videomerger.utils.file_utils import (
+    DEFAULT_FILE_MODE,
+    clean_upload_folder,
+    delete_files,
+    write_stream,
+)
+
+
+def test_clean_upload_folder_keeps_recent(tmp_path):
+    """Test cleanup keeps only the newest files."""
+    for index in range(5):
+        path = tmp_path / f'video{index}.mp4'
+        path.write_bytes(b'fake video content')
+        os.utime(path, (index, index))
+
+    clean_upload_folder(str(tmp_path), keep_recent=2)
+
+    assert sorted(os.listdir(tmp_path)) == ['video3.mp4', 'video4.mp4']
+
+
+def test_clean_upload_folder_missing_folder(tmp_path):
+    """Test cleanup of a folder that doesn't exist."""
+    clean_upload_folder(str(tmp_path / 'missing'))
+
+
+def test_clean_upload_folder_skips_vanished_files(tmp_path, monkeypatch):
+    """Test cleanup skips files removed while the folder is being read."""
+    for name in ('gone.mp4', 'video.mp4'):
+        (tmp_path / name).write_bytes(b'fake video content')
+
+    real_scandir = os.scandir
+
+    class VanishingScandir:
+        def __init__(self, path):
+            self._entries = real_scandir(path)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            self._entries.close()
+
+        def __iter__(self):
+            for entry in self._entries:
+                if entry.name == 'gone.mp4':
+                    os.remove(entry.path)
+                yield entry
+
+    monkeypatch.setattr(os, 'scandir', VanishingScandir)
+
+    clean_upload_folder(str(tmp_path))
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_delete_files_ignores_missing(tmp_path):
+    """Test deleting a mix of existing and missing files."""
+    paths = []
+    for index in range(3):
+        path = tmp_path / f'video{index}.mp4'
+        path.write_bytes(b'fake video content')
+        paths.append(str(path))
+    paths.append(str(tmp_path / 'missing.mp4'))
+
+    delete_files(paths)
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_write_stream_replaces_atomically(tmp_path):
+    """Test streamed writes publish a complete file with the default mode."""
+    destination = tmp_path / 'video.mp4'
+    destination.write_bytes(b'old')
+
+    write_stream(io.BytesIO(b'new video content'), str(destination))
+
+    assert destination.read_bytes() == b'new video content'
+    assert destination.stat().st_mode & 0o777 == DEFAULT_FILE_MODE
+    assert os.listdir(tmp_path) == ['video.mp4']
@@ -0,0 +1,192 @@
+"""Unit tests for remote video downloads."""
+import http.server
+import io
+import threading
+import urllib.error
+
+import pytest
+
+from videomerger.utils import http_download
+from videomerger.utils.http_download import download_file
+
+URL = 'http://videos.example.com/clip.mp4'
+
+
+class _FakeResponse(io.BytesIO):
+    def __init__(self, body, status=200, headers=None):
+        super().__init__(body)
+        self.status = status
+        self.headers = headers or {}
+
+
+class _FakeServer:
+    """Stand-in for the download opener serving one file."""
+
+    def __init__(self, body, ranges=True, honor_ranges=True, head=True, length=True):
+        self.body = body
+        self.ranges = ranges
+        self.honor_ranges = honor_ranges
+        self.head = head
+        self.length = length
+        self.requests = []
+
+    def open(self, request, timeout=None):
+        self.requests.append(request)
+        headers = {'Accept-Ranges': 'bytes'} if self.ranges else {}
+        if self.length:
+            headers['Content-Length'] = str(len(self.body))
+        if request.get_method() == 'HEAD':
+            if not self.head:
+                raise urllib.error.HTTPError(URL, 405, 'Method Not Allowed', {}, None)
+            return _FakeResponse(b'', headers=headers)
+        byte_range = request.get_header('Range')
+        if byte_range and self.honor_ranges:
+            start, end = map(int, byte_range[len('bytes='):].split('-'))
+            return self.range_response(start, end)
+        return _FakeResponse(self.body)
+
+    def range_response(self, start, end):
+        return _FakeResponse(
+            self.body[start:end + 1],
+            status=206,
+            headers={'Content-Range': f'bytes {start}-{end}/{len(self.body)}'},
+        )
+
+    def range_requests(self):
+        return [r for r in self.requests if r.get_header('Range')]
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    """Route downloads to a fake server."""
+    def install(server):
+        monkeypatch.setattr(http_download, '_opener', server)
+        return server
+    return install
+
+
+def test_download_single_connection(serve, tmp_path):
+    """Test that small files are fetched with one plain GET."""
+    server = serve(_FakeServer(b'small video'))
+    destination = tmp_path / 'clip.mp4'
+
+    download_file(URL, str(destination))
+
+    assert destination.read_bytes() == b'small video'
+    assert server.range_requests() == []
+
+
+def test_download_splits_ranges(serve, monkeypatch, tmp_path):
+    """Test that large files are split across parallel range requests."""
+    body = bytes(range(256)) * 40
+    server = serve(_FakeServer(body))
+    monkeypatch.setattr(http_download, 'MIN_PARALLEL_SIZE', 1024)
+    destination = tmp_path / 'clip.mp4'
+
+    download_file(URL, str(destination), connections=4)
+
+    assert destination.read_bytes() == body
+    assert len(server.range_requests()) == 4
+
+
+def test_download_server_ignores_range(serve, monkeypatch, tmp_path):
+    """Test that a 200 reply to a range request is an error, not corrupt output."""
+    serve(_FakeServer(b'x' * 4096, honor_ranges=False))
+    monkeypatch.setattr(http_download, 'MIN_PARALLEL_SIZE', 1024)
+
+    with pytest.raises(RuntimeError):
+        download_file(URL, str(tmp_path / 'clip.mp4'))
+
+
+@pytest.mark.parametrize('fault', ['short', 'wrong_range'])
+def test_download_rejects_bad_partial_content(serve, monkeypatch, tmp_path, fault):
+    """Test that a 206 reply must carry exactly the requested slice."""
+    class Server(_FakeServer):
+        def range_response(self, start, end):
+            response = super().range_response(start, end)
+            if fault == 'short':
+                response = _FakeResponse(
+                    self.body[start:end], status=206, headers=response.headers
+                )
+            else:
+                response.headers['Content-Range'] = f'bytes 0-{end - start}/{len(self.body)}'
+            return response
+
+    serve(Server(bytes(range(256)) * 16))
+    monkeypatch.setattr(http_download, 'MIN_PARALLEL_SIZE', 1024)
+
+    with pytest.raises(RuntimeError):
+        download_file(URL, str(tmp_path / 'clip.mp4'))
+
+
+def test_download_head_not_allowed(serve, tmp_path):
+    """Test that a server rejecting HEAD is downloaded with a single GET."""
+    server = serve(_FakeServer(b'video without head', head=False))
+    destination = tmp_path / 'clip.mp4'
+
+    download_file(URL, str(destination))
+
+    assert destination.read_bytes() == b'video without head'
+    assert [r.get_method() for r in server.requests] == ['HEAD', 'GET']
+
+
+def test_download_size_limit(serve, tmp_path):
+    """Test that downloads over the limit are refused, declared or not."""
+    serve(_FakeServer(b'x' * 100))
+    with pytest.raises(ValueError):
+        download_file(URL, str(tmp_path / 'declared.mp4'), max_size=10)
+
+    serve(_FakeServer(b'x' * 100, length=False))
+    with pytest.raises(ValueError):
+        download_file(URL, str(tmp_path / 'streamed.mp4'), max_size=10)
+
+
+def _start_server(handler):
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_download_never_contacts_redirect_target(tmp_path):
+    """Test that a cross-origin redirect is refused before it is followed."""
+    internal_requests = []
+
+    class Internal(http.server.BaseHTTPRequestHandler):
+        def do_HEAD(self):
+            internal_requests.append(self.path)
+            self.send_response(200)
+            self.end_headers()
+
+        do_GET = do_HEAD
+
+        def log_message(self, *args):
+            pass
+
+    internal = _start_server(Internal)
+    target = f'http://127.0.0.1:{internal.server_address[1]}/admin/delete'
+
+    class Public(http.server.BaseHTTPRequestHandler):
+        def do_HEAD(self):
+            self.send_response(302)
+            self.send_header('Location', target)
+            self.end_headers()
+
+        do_GET = do_HEAD
+
+        def log_message(self, *args):
+            pass
+
+    public = _start_server(Public)
+    try:
+        with pytest.raises(ValueError):
+            download_file(
+                f'http://127.0.0.1:{public.server_address[1]}/clip.mp4',
+                str(tmp_path / 'clip.mp4'),
+                timeout=5,
+            )
+    finally:
+        for server in (public, internal):
+            server.shutdown()
+            server.server_close()
+
+    assert internal_requests == []
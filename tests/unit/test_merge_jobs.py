@@ -0,0 +1,40 @@
+"""Tests for the background merge job queue."""
+import json
+import os
+import time
+import uuid
+
+from videomerger.core.merge_jobs import STALE_AFTER, MergeJobQueue
+
+
+def _write_job(folder, status, age):
+    job_id = uuid.uuid4().hex
+    path = os.path.join(folder, f"{job_id}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"status": status, "job_id": job_id}, f)
+    updated = time.time() - age
+    os.utime(path, (updated, updated))
+    return job_id, path
+
+
+def test_stale_running_job_reported_failed(tmp_path):
+    """Test that a job whose worker stopped heartbeating is reported failed."""
+    queue = MergeJobQueue(None, str(tmp_path))
+    stale_id, _ = _write_job(str(tmp_path), "running", STALE_AFTER + 60)
+    live_id, _ = _write_job(str(tmp_path), "running", 0)
+
+    assert queue.get_status(stale_id)["status"] == "failed"
+    assert queue.get_status(live_id)["status"] == "running"
+
+
+def test_expire_old_jobs(tmp_path):
+    """Test that status files older than the retention period are removed."""
+    queue = MergeJobQueue(None, str(tmp_path), retention=3600)
+    old_id, old_path = _write_job(str(tmp_path), "completed", 7200)
+    new_id, new_path = _write_job(str(tmp_path), "completed", 60)
+
+    queue.expire_old_jobs()
+
+    assert not os.path.exists(old_path)
+    assert os.path.exists(new_path)
+    assert queue.get_status(old_id) is None
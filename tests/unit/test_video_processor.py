@@ -48,3 +48,24 @@ def test_get_video_info(sample_video_file):
     assert 'path' in info
     assert 'exists' in info
     assert info['exists'] is True
+
+
+def test_validate_unsupported_format(tmp_path):
+    """Test validation rejects existing files with unsupported extensions."""
+    path = tmp_path / 'notes.txt'
+    path.write_bytes(b'not a video')
+    processor = VideoProcessor()
+    assert processor.validate_video(str(path)) is False
+
+
+def test_remote_inputs_need_allowed_host():
+    """Test remote inputs are refused unless their host is allow-listed."""
+    url = 'https://videos.example.com/clip.mp4'
+
+    with pytest.raises(ValueError):
+        VideoProcessor().merge_videos([url, url], 'output.mp4')
+
+    processor = VideoProcessor(remote_hosts=['Videos.Example.com'])
+    processor.check_remote_inputs([url, '/local/clip.mp4'])
+    with pytest.raises(ValueError):
+        processor.check_remote_inputs(['http://127.0.0.1/clip.mp4'])
@@ -0,0 +1,214 @@
+"""Unit tests for the FFmpeg command-line helpers."""
+import io
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from videomerger import video_processor_cli as cli
+
+
+def _fake_run(stdout):
+    def run(cmd, **kwargs):
+        return subprocess.CompletedProcess(cmd, 0, stdout=stdout, stderr='')
+    return run
+
+
+def _probe(signature):
+    return {
+        'width': 1280,
+        'height': 720,
+        'fps': 30.0,
+        'duration': 1.0,
+        'has_audio': True,
+        'signature': signature,
+    }
+
+
+def test_probe_video_parses_ffprobe_json(monkeypatch):
+    """Test that one ffprobe call fills every field merge_videos uses."""
+    probe = {
+        'streams': [
+            {
+                'codec_type': 'video',
+                'codec_name': 'h264',
+                'width': 1280,
+                'height': 720,
+                'r_frame_rate': '30000/1001',
+                'pix_fmt': 'yuv420p',
+            },
+            {
+                'codec_type': 'audio',
+                'codec_name': 'aac',
+                'sample_rate': '48000',
+                'channels': 2,
+            },
+        ],
+        'format': {'duration': '12.5'},
+    }
+    monkeypatch.setattr(subprocess, 'run', _fake_run(json.dumps(probe)))
+
+    info = cli.probe_video('clip.mp4')
+
+    assert info['width'] == 1280
+    assert info['height'] == 720
+    assert round(info['fps'], 2) == 29.97
+    assert info['duration'] == 12.5
+    assert info['has_audio'] is True
+    assert info['signature'] == (
+        'h264', 1280, 720, '30000/1001', 'yuv420p', 'aac', '48000', 2
+    )
+
+
+def test_probe_video_without_video_stream(monkeypatch):
+    """Test that unreadable output falls back to defaults with no signature."""
+    probe = {'streams': [{'codec_type': 'audio'}], 'format': {}}
+    monkeypatch.setattr(subprocess, 'run', _fake_run(json.dumps(probe)))
+
+    info = cli.probe_video('clip.mp4')
+
+    assert info['has_audio'] is True
+    assert info['signature'] is None
+    assert (info['width'], info['height']) == (1920, 1080)
+
+    monkeypatch.setattr(subprocess, 'run', _fake_run('not json'))
+    assert cli.probe_video('clip.mp4')['signature'] is None
+
+
+def test_can_stream_copy():
+    """Test that stream copy needs identical signatures in the target codec."""
+    h264 = ('h264', 1280, 720, '30/1', 'yuv420p', 'aac', '48000', 2)
+    hevc = ('hevc',) + h264[1:]
+    other_size = ('h264', 1920, 1080) + h264[3:]
+
+    assert cli.can_stream_copy([_probe(h264), _probe(h264)], 'H.264')
+    assert cli.can_stream_copy([_probe(hevc), _probe(hevc)], 'H.265')
+    assert not cli.can_stream_copy([_probe(h264), _probe(h264)], 'H.265')
+    assert not cli.can_stream_copy([_probe(h264), _probe(other_size)], 'H.264')
+    assert not cli.can_stream_copy([_probe(None), _probe(None)], 'H.264')
+
+
+class _FakeProcess:
+    returncode = 0
+
+    def __init__(self, cmd, **kwargs):
+        self.stdout = io.StringIO('')
+
+    def wait(self):
+        return self.returncode
+
+
+def test_merge_falls_back_when_stream_copy_fails(monkeypatch, tmp_path):
+    """Test that a failed stream copy re-encodes instead of failing."""
+    signature = ('h264', 1280, 720, '30/1', 'yuv420p', 'aac', '48000', 2)
+    concat_calls = []
+
+    def concat_copy(paths, output_path):
+        concat_calls.append(list(paths))
+        return len(concat_calls) > 1
+
+    monkeypatch.setattr(cli, 'probe_video', lambda path: _probe(signature))
+    monkeypatch.setattr(cli, '_concat_copy', concat_copy)
+    monkeypatch.setattr(subprocess, 'Popen', _FakeProcess)
+
+    inputs = ['a.mp4', 'b.mp4']
+    assert cli.merge_videos(inputs, str(tmp_path / 'out.mp4'))
+    assert concat_calls[0] == inputs
+    assert len(concat_calls) == 2 and concat_calls[1] != inputs
+
+
+def test_hw_encoder_args():
+    """Test the arguments built for each hardware encoder family."""
+    assert cli._hw_encoder_args('h264_nvenc', 'high') == ([], '', [
+        '-c:v', 'h264_nvenc', '-preset', 'p7', '-rc', 'vbr',
+        '-cq', '18', '-b:v', '0',
+    ])
+    assert cli._hw_encoder_args('hevc_qsv', 'low') == ([], '', [
+        '-c:v', 'hevc_qsv', '-preset', 'veryfast', '-global_quality', '28',
+    ])
+    assert cli._hw_encoder_args('h264_videotoolbox', 'unknown') == (
+        [], '', ['-c:v', 'h264_videotoolbox', '-q:v', '65']
+    )
+    assert cli._hw_encoder_args('h264_vaapi', 'medium') == (
+        ['-vaapi_device', cli._VAAPI_DEVICE],
+        ',format=nv12,hwupload',
+        ['-c:v', 'h264_vaapi', '-qp', '23'],
+    )
+
+
+def test_hw_failure_reencodes_all_clips_in_software(monkeypatch, tmp_path, capsys):
+    """Test a hardware failure re-runs every clip in software, with monotonic progress."""
+    commands = []
+
+    class Process(_FakeProcess):
+        def __init__(self, cmd, **kwargs):
+            commands.append(cmd)
+            # Hardware gets halfway through, then fails on the second clip
+            self.stdout = io.StringIO('out_time_ms=500000\n')
+            hardware = 'h264_nvenc' in cmd
+            self.returncode = 1 if hardware and cmd[-1].endswith('norm_1.mp4') else 0
+
+    sizes = iter([(1280, 720), (640, 360)])
+
+    def probe(path):
+        info = _probe(None)
+        info['width'], info['height'] = next(sizes)
+        return info
+
+    monkeypatch.setattr(cli, 'probe_video', probe)
+    monkeypatch.setattr(cli, '_select_hw_encoder', lambda codec: 'h264_nvenc')
+    monkeypatch.setattr(cli, '_concat_copy', lambda paths, output_path: True)
+    monkeypatch.setattr(subprocess, 'Popen', Process)
+
+    assert cli.merge_videos(
+        ['a.mp4', 'b.mp4'], str(tmp_path / 'out.mp4'), hw_accel='auto'
+    )
+
+    software = [cmd for cmd in commands if 'libx264' in cmd]
+    assert len(commands) == 4
+    assert sorted(cmd[-1][-10:] for cmd in software) == ['norm_0.mp4', 'norm_1.mp4']
+
+    progress = [
+        int(line.split()[1])
+        for line in capsys.readouterr().out.splitlines()
+        if line.startswith('PROGRESS:')
+    ]
+    assert progress == sorted(progress)
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='fallocate is Linux only')
+def test_preallocate_reserves_blocks(tmp_path):
+    """Test the reservation allocates blocks without growing the file."""
+    path = tmp_path / 'out.mp4'
+    size = 4 * 1024 * 1024
+    if not cli._preallocate(str(path), size):
+        pytest.skip('filesystem does not support fallocate')
+
+    stat = os.stat(path)
+    assert stat.st_size == 0
+    assert stat.st_blocks * 512 >= size
+
+
+def test_concat_failure_releases_reservation(monkeypatch, tmp_path):
+    """Test a failed concat removes the preallocated output."""
+    output = tmp_path / 'out.mp4'
+    clips = []
+    for name in ('a.mp4', 'b.mp4'):
+        clip = tmp_path / name
+        clip.write_bytes(b'x' * 1024)
+        clips.append(str(clip))
+
+    def preallocate(path, size):
+        open(path, 'wb').close()
+        return True
+
+    def failing_run(cmd, **kwargs):
+        return subprocess.CompletedProcess(cmd, 1, stdout=b'', stderr=b'')
+
+    monkeypatch.setattr(cli, '_preallocate', preallocate)
+    monkeypatch.setattr(subprocess, 'run', failing_run)
+
+    assert not cli._concat_copy(clips, str(output))
+    assert not output.exists()